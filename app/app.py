@@ -1,20 +1,29 @@
 # app/app.py
-import requests
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 from collections import deque
-
-# ---------------- PAGE CONFIG ----------------
-st.set_page_config(
-    page_title="TimeShiftAI — Future Decision Lab",
-    page_icon="🕰️",
-    layout="wide",
+from typing import Optional
+from utils.advisor import classify, render_advice, risk_bucket
+from utils.simulation_core import BASE_GROWTH, SCENARIO_NAMES, VOLATILITY, simulate_scenarios
+
+# Happiness mock ranges (illustrative)
+_HAPPINESS_NAMES = ("Stay in Job", "Go Freelance", "Join Startup")
+_HAPPINESS_LOW = np.array([6, 7, 4])
+_HAPPINESS_HIGH = np.array([8, 9, 7])
+
+# Decision-summary tip per risk_bucket (low, medium, high)
+_RISK_TIPS = (
+    (st.info, "Your profile shows low risk tolerance. A stable job with controlled savings and modest investments is recommended."),
+    (st.info, "Medium risk tolerance: consider hybrid strategies (part-time freelancing / side projects + core job) and diversified investment."),
+    (st.success, "High risk tolerance: you may consider higher-growth paths (startup, freelancing) while maintaining a clear contingency fund."),
 )
 
-# ---------------- SAFE CSS ----------------
-st.markdown(
-    """
+_PAGE_CSS = """
     <style>
         /* Hide Streamlit sidebar controls safely */
         [data-testid="collapsedControl"], [data-testid="stSidebar"] {
@@ -43,10 +52,18 @@ st.markdown(
 
         .block-container { max-width: 1150px; margin: auto; }
     </style>
-    """,
-    unsafe_allow_html=True,
+    """
+
+# ---------------- PAGE CONFIG ----------------
+st.set_page_config(
+    page_title="TimeShiftAI — Future Decision Lab",
+    page_icon="🕰️",
+    layout="wide",
 )
 
+# ---------------- SAFE CSS ----------------
+st.markdown(_PAGE_CSS, unsafe_allow_html=True)
+
 # ---------------- HEADER ----------------
 st.title("🕰️ TimeShiftAI — Future Decision Lab")
 st.markdown(
@@ -57,74 +74,103 @@ st.markdown(
 # ---------------- USER INPUT SECTION ----------------
 st.markdown("#### ⚙️ Configure Your Profile and Simulation")
 
-# Row 1: Core Finances
-col1, col2, col3 = st.columns(3)
-with col1:
-    currency = st.selectbox("Preferred Currency 💱", ["AED", "USD", "INR", "EUR", "GBP"])
-    salary = st.number_input(f"Monthly Salary ({currency})", value=15000, step=500)
-with col2:
-    family_expense = st.number_input(f"Monthly Family Expense ({currency})", value=5000, step=250)
-    emi = st.number_input(f"Monthly EMIs ({currency})", value=2000, step=250)
-with col3:
-    savings = st.number_input(f"Current Savings ({currency})", value=10000, step=500)
-
-# Small visual divider
-st.markdown("<hr style='margin: 1.5rem 0; border: 1px solid #eee;'>", unsafe_allow_html=True)
-st.markdown("#### 🎯 Simulation Settings")
-
-# Row 2: Simulation Parameters
-col4, col5, col6 = st.columns(3)
-with col4:
-    risk_tolerance = st.slider("Risk Appetite (0 = Low, 10 = High)", 0, 10, 5)
-with col5:
-    years = st.slider("Years to Simulate", 1, 20, 10)
-with col6:
-    growth_bias = st.slider("Market Growth Bias (%)", 0, 15, 5)
+# Widgets inside the form only trigger a rerun when "Run Simulation" is pressed
+with st.form("inputs"):
+    # Row 1: Core Finances
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        currency = st.selectbox("Preferred Currency 💱", ["AED", "USD", "INR", "EUR", "GBP"])
+        salary = st.number_input(f"Monthly Salary ({currency})", value=15000, step=500)
+    with col2:
+        family_expense = st.number_input(f"Monthly Family Expense ({currency})", value=5000, step=250)
+        emi = st.number_input(f"Monthly EMIs ({currency})", value=2000, step=250)
+    with col3:
+        savings = st.number_input(f"Current Savings ({currency})", value=10000, step=500)
+
+    # Small visual divider
+    st.markdown("<hr style='margin: 1.5rem 0; border: 1px solid #eee;'>", unsafe_allow_html=True)
+    st.markdown("#### 🎯 Simulation Settings")
+
+    # Row 2: Simulation Parameters
+    col4, col5, col6 = st.columns(3)
+    with col4:
+        risk_tolerance = st.slider("Risk Appetite (0 = Low, 10 = High)", 0, 10, 5)
+    with col5:
+        years = st.slider("Years to Simulate", 1, 20, 10)
+    with col6:
+        growth_bias = st.slider("Market Growth Bias (%)", 0, 15, 5)
+
+    st.form_submit_button("Run Simulation", type="primary")
+
+# One Generator per session, seeded from a stored seed; "Reseed" draws a new seed from it
+if "rng" not in st.session_state:
+    st.session_state["rng"] = np.random.default_rng(st.session_state.setdefault("seed", 42))
+if st.button("🎲 Reseed Simulation"):
+    st.session_state["seed"] = int(st.session_state["rng"].integers(2**31))
+    st.session_state["rng"] = np.random.default_rng(st.session_state["seed"])
 
 
 
 # ---------------- Currency conversion (safe) ----------------
-base_currency = "AED"
-conversion_rate = 1.0
-if currency != base_currency:
+@st.cache_resource
+def _http_session():
+    """Shared keep-alive session so FX lookups reuse one HTTPS connection across reruns."""
+    # imported here so sessions that stay in AED never load requests
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry
+
+    session = requests.Session()
+    retry = Retry(total=2, read=0, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    session.mount("https://", HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=10))
+    return session
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_fx_rate(base: str, target: str) -> float:
+    """Latest base->target rate, memoized for an hour per currency pair."""
+    r = _http_session().get(f"https://api.exchangerate.host/latest?base={base}&symbols={target}", timeout=(3, 5))
+    r.raise_for_status()
+    return float(r.json()["rates"][target])
+
+# Short negative cache: a broken API costs at most one round-trip per minute
+@st.cache_data(ttl=60, show_spinner=False)
+def fx_rate_or_none(base: str, target: str) -> Optional[float]:
+    """get_fx_rate that returns None on failure; failures are remembered for a minute."""
     try:
-        resp = requests.get(f"https://api.exchangerate.host/latest?base={base_currency}&symbols={currency}", timeout=5)
-        if resp.status_code == 200:
-            rates = resp.json().get("rates", {})
-            conversion_rate = float(rates.get(currency, 1.0))
-        else:
-            st.warning("⚠️ Currency API returned an error. Values shown in AED.")
-            conversion_rate = 1.0
+        return get_fx_rate(base, target)
     except Exception:
-        st.warning("⚠️ Could not fetch currency rates. Values shown in AED.")
-        conversion_rate = 1.0
+        return None
+
+base_currency = "AED"
+conversion_rate = 1.0 if currency == base_currency else fx_rate_or_none(base_currency, currency)
+if conversion_rate is None:
+    st.warning("⚠️ Could not fetch currency rates. Values shown in AED.")
+    conversion_rate = 1.0
 
 # ---------------- Scenario definitions ----------------
-scenarios = {
-    "Stay in Job": {"growth": 0.05 + growth_bias / 100, "volatility": 0.02},
-    "Join Startup": {"growth": 0.12 + growth_bias / 100, "volatility": 0.08},
-    "Go Freelance": {"growth": 0.08 + growth_bias / 100, "volatility": 0.05},
-}
+growth = BASE_GROWTH + growth_bias / 100
 
 # ---------------- Simulation ----------------
-data = []
-for scenario_name, params in scenarios.items():
-    incomes = [salary * 12]
-    wealth = [savings]
-    for year in range(1, years + 1):
-        # income evolves by growth + stochastic noise (normal)
-        inc = incomes[-1] * (1 + np.random.normal(params["growth"], params["volatility"]))
-        yearly_expense = (family_expense + emi) * 12
-        net = wealth[-1] + inc - yearly_expense
-        incomes.append(inc)
-        wealth.append(net)
-    df = pd.DataFrame({"Year": list(range(0, years + 1)), "Wealth": wealth})
-    df["Scenario"] = scenario_name
-    data.append(df)
-
-df_all = pd.concat(data, ignore_index=True)
-df_display = df_all.copy()
-df_display["Wealth"] = df_display["Wealth"] * conversion_rate
+@st.cache_data(show_spinner=False)
+def run_simulation(salary, savings, family_expense, emi, years, growth_bias, seed):
+    """Monte Carlo wealth paths, shape (n_scenarios, years + 1), memoized on the numeric inputs."""
+    growth = BASE_GROWTH + growth_bias / 100
+    yearly_expense = (family_expense + emi) * 12
+    return simulate_scenarios(salary, savings, yearly_expense, years, growth, VOLATILITY, seed)
+
+# seed only changes on "Reseed", so reruns with unchanged inputs hit the cache
+wealth_mat = run_simulation(salary, savings, family_expense, emi, years, growth_bias, st.session_state["seed"])
+pivot = pd.DataFrame(
+    wealth_mat.T * conversion_rate,
+    index=pd.RangeIndex(years + 1, name="Year"),
+    columns=list(SCENARIO_NAMES),
+)
+
+@st.cache_data
+def happiness_scores(risk_tol: int, seed: int) -> pd.Series:
+    """Illustrative happiness scores, fixed for a given risk appetite and session seed."""
+    scores = np.random.default_rng(seed + risk_tol).uniform(_HAPPINESS_LOW, _HAPPINESS_HIGH)
+    return pd.Series(dict(zip(_HAPPINESS_NAMES, scores)), name="Happiness Score")
 
 # ---------------- Results area ----------------
 st.markdown("---")
@@ -133,127 +179,76 @@ st.markdown("### 📈 Simulation Results")
 left_col, right_col = st.columns([1.7, 1])
 with left_col:
     st.subheader(f"Projected Wealth Over {years} Years ({currency})")
-    pivot = df_display.pivot(index="Year", columns="Scenario", values="Wealth")
     st.line_chart(pivot, height=420)
 
 with right_col:
     st.subheader("Snapshot Insights")
-    last_values = df_all[df_all["Year"] == years][["Scenario", "Wealth"]].reset_index(drop=True)
-    # protect against degenerate cases
-    if not last_values.empty:
-        best_row = last_values.loc[last_values["Wealth"].idxmax()]
-        worst_row = last_values.loc[last_values["Wealth"].idxmin()]
-        best_wealth = float(best_row["Wealth"]) * conversion_rate
-        worst_wealth = float(worst_row["Wealth"]) * conversion_rate
-        st.metric("💹 Best Financial Path", best_row["Scenario"], f"{best_wealth:,.0f} {currency}")
-        st.metric("⚠️ Lowest Return Path", worst_row["Scenario"], f"{worst_wealth:,.0f} {currency}")
-    else:
-        st.write("No results to display.")
+    final = wealth_mat[:, -1]
+    best_i, worst_i = int(np.argmax(final)), int(np.argmin(final))
+    best_wealth = final[best_i] * conversion_rate
+    worst_wealth = final[worst_i] * conversion_rate
+    st.metric("💹 Best Financial Path", SCENARIO_NAMES[best_i], f"{best_wealth:,.0f} {currency}")
+    st.metric("⚠️ Lowest Return Path", SCENARIO_NAMES[worst_i], f"{worst_wealth:,.0f} {currency}")
 
     # Simple happiness mock (illustrative)
-    happiness = {
-        "Stay in Job": np.random.uniform(6, 8),
-        "Go Freelance": np.random.uniform(7, 9),
-        "Join Startup": np.random.uniform(4, 7),
-    }
-    hdf = pd.DataFrame.from_dict(happiness, orient="index", columns=["Happiness Score"])
-    st.bar_chart(hdf)
+    st.bar_chart(happiness_scores(risk_tolerance, st.session_state["seed"]))
 
 # ---------------- Decision summary ----------------
 st.markdown("---")
 st.subheader("💡 Decision Intelligence Summary")
-if risk_tolerance <= 3:
-    st.info("Your profile shows low risk tolerance. A stable job with controlled savings and modest investments is recommended.")
-elif 4 <= risk_tolerance <= 7:
-    st.info("Medium risk tolerance: consider hybrid strategies (part-time freelancing / side projects + core job) and diversified investment.")
-else:
-    st.success("High risk tolerance: you may consider higher-growth paths (startup, freelancing) while maintaining a clear contingency fund.")
+show_tip, tip_text = _RISK_TIPS[risk_bucket(risk_tolerance)]
+show_tip(tip_text)
 
-st.caption("Tip: adjust EMIs, family expense and growth bias to see the metric shifts in real time.")
+st.caption("Tip: adjust EMIs, family expense and growth bias, then press Run Simulation to see the metrics shift.")
 
 # ---------------- Session-only AI chat memory ----------------
 if "chat_memory" not in st.session_state:
     # remember up to 5 last prompts during the session
     st.session_state.chat_memory = deque(maxlen=5)
+    # joined form of chat_memory, rebuilt only when a prompt is appended
+    st.session_state.chat_summary = "no recent questions"
 
 st.markdown("---")
 st.subheader("🤖 TimeShiftAI Advisor — Professional, Analytical")
 
 prompt = st.text_input("Ask TimeShiftAI a question (e.g., 'Should I join a startup or stay in my job?')")
 
-def compose_context(memory_deque, salary, savings, emi, family_expense, risk_tol, years):
+def compose_context(mem_summary, salary, savings, emi, family_expense, risk_tol, years):
     """Create a short analytical context summary for the AI response."""
-    mem_summary = " ; ".join(list(memory_deque)) if memory_deque else "no recent questions"
     context = (
         f"Context: salary={salary}, savings={savings}, emi={emi}, family_expense={family_expense}, "
         f"risk_tolerance={risk_tol}, years={years}. Recent prompts: {mem_summary}."
     )
     return context
 
-def analytical_response(user_q: str, memory_deque, salary, savings, emi, family_expense, risk_tol, years):
+def analytical_response(user_q: str, mem_summary, salary, savings, emi, family_expense, risk_tol, years):
     """Return a professional analytical response derived from user question + session memory + numeric inputs."""
-    ctx = compose_context(memory_deque, salary, savings, emi, family_expense, risk_tol, years)
-
-    q = user_q.lower()
-    # Basic rule-based analysis. This is deterministic and data-aware (no external LLM).
-    if "startup" in q:
-        # give data-aware guidance
-        est_runway = savings / ((family_expense + emi) if (family_expense + emi) > 0 else 1)
-        advice = (
-            f"Joining a startup typically increases income volatility. With current savings of {savings:,.0f} "
-            f"and monthly outflows {(family_expense + emi):,.0f}, your runway is ~{est_runway:.1f} months. "
-            "If runway < 6 months, secure additional buffer or phased transition. "
-        )
-        if risk_tol <= 3:
-            advice += "Your low risk tolerance suggests avoiding full-time startup exposure."
-        elif risk_tol <= 7:
-            advice += "Consider a part-time pilot or equity-for-lower-pay arrangement initially."
-        else:
-            advice += "Your profile supports higher risk; ensure legal/financial protections and plan exits."
-        return f"{advice}\n\n{ctx}"
-    if "freelance" in q or "freelancing" in q:
-        avg_monthly_need = (family_expense + emi)
-        advice = (
-            f"Freelancing gives flexibility but variable revenue. Target building a 3–6 month revenue pipeline before leaving a steady job. "
-            f"With monthly obligations of {avg_monthly_need:,.0f}, ensure contracts or retained clients cover core expenses."
-        )
-        if risk_tol <= 3:
-            advice += " Given low risk tolerance, keep freelancing as a secondary income initially."
-        else:
-            advice += " Consider a 3–6 month trial period and track client churn metrics."
-        return f"{advice}\n\n{ctx}"
-    if "save" in q or "savings" in q or "save more" in q:
-        monthly_income = salary
-        recommended_pct = 0.25 if risk_tol >= 4 else 0.2
-        recommendation = (
-            f"Analytical recommendation: target saving {int(recommended_pct*100)}% of monthly income. "
-            f"Automate transfers to a liquid emergency fund first, then systematic investments (monthly)."
-        )
-        return f"{recommendation}\n\n{ctx}"
-    if "compare" in q and "job" in q and "startup" in q:
-        # quick quantitative comparison using first-year expectation
-        job_growth = scenarios["Stay in Job"]["growth"]
-        startup_growth = scenarios["Join Startup"]["growth"]
-        compare = (
-            f"Model comparison (first-order): expected growth rate job={job_growth:.2%}, startup={startup_growth:.2%}. "
-            "Startups show higher mean growth but higher volatility; quantify required emergency buffer and expected income variance."
-        )
-        return f"{compare}\n\n{ctx}"
-    # fallback professional answer referencing memory and inputs
-    fallback = (
-        "I recommend running 'what-if' experiments in the simulator for scenarios you care about (e.g., +20% salary, +30% family expenses). "
-        "If you provide a specific hypothesis (e.g., 'What if my salary increases by 20% in 2 years?') I will produce a focused analytical recommendation."
+    ctx = compose_context(mem_summary, salary, savings, emi, family_expense, risk_tol, years)
+
+    # Basic rule-based analysis. This is deterministic and data-aware (no external LLM);
+    # the advice text is memoized in utils.advisor, only the context line is rebuilt.
+    advice = render_advice(
+        classify(user_q),
+        risk_bucket(risk_tol),
+        savings,
+        emi,
+        family_expense,
+        float(growth[SCENARIO_NAMES.index("Stay in Job")]),
+        float(growth[SCENARIO_NAMES.index("Join Startup")]),
     )
-    return f"{fallback}\n\n{ctx}"
+    return f"{advice}\n\n{ctx}"
 
 # When user submits a prompt:
 if prompt:
-    # record prompt in session memory
-    st.session_state.chat_memory.append(prompt)
+    # record prompt in session memory (the text box keeps its value across reruns)
+    memory = st.session_state.chat_memory
+    if not memory or memory[-1] != prompt:
+        memory.append(prompt)
+        st.session_state.chat_summary = " ; ".join(memory)
     # compute response
     resp_text = analytical_response(
         prompt,
-        st.session_state.chat_memory,
+        st.session_state.chat_summary,
         salary,
         savings,
         emi,
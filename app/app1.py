@@ -3,9 +3,7 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import streamlit as st
-import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from utils.simulation_core import simulate_path
 
 st.set_page_config(page_title="Time-Shift AI", page_icon="⏳", layout="centered")
@@ -3,9 +3,8 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import streamlit as st
-from utils.simulation_core import simulate_path
-import numpy as np
-import matplotlib.pyplot as plt
+import pandas as pd
+from utils.simulation_core import simulate_path, simulate_ensemble, ensemble_bands
 
 # --------------------------------------------
 # APP TITLE
@@ -33,7 +32,6 @@ st.sidebar.write("💡 Tip: Adjust risk and volatility to see how outcomes diver
 # --------------------------------------------
 st.subheader("🔮 Predicted Income Trajectories")
 
-np.random.seed(42)
 paths = {
     "Stable Path": simulate_path(base_salary, growth_rate, volatility * 0.5, risk_tolerance * 0.8, years, seed=1),
     "Balanced Path": simulate_path(base_salary, growth_rate, volatility, risk_tolerance, years, seed=2),
@@ -43,15 +41,21 @@ paths = {
 # --------------------------------------------
 # PLOT RESULTS
 # --------------------------------------------
-fig, ax = plt.subplots(figsize=(8, 5))
-for name, vals in paths.items():
-    ax.plot(range(1, years + 1), vals, label=name, linewidth=2)
-ax.set_title("Career Income Projections (AED)")
-ax.set_xlabel("Years Ahead")
-ax.set_ylabel("Projected Annual Income")
-ax.legend()
-ax.grid(True, linestyle="--", alpha=0.5)
-st.pyplot(fig)
+df = pd.DataFrame(paths, index=pd.RangeIndex(1, years + 1, name="Years Ahead"))
+st.line_chart(df, height=420, x_label="Years Ahead", y_label="Projected Annual Income (AED)")
+
+# --------------------------------------------
+# UNCERTAINTY FAN (BALANCED PATH)
+# --------------------------------------------
+st.subheader("🌗 Range of Outcomes — Balanced Path")
+ensemble = simulate_ensemble(500, base_salary, growth_rate, volatility, risk_tolerance, years, seed=2)
+bands = ensemble_bands(ensemble)
+fan_df = pd.DataFrame(
+    {"5th Percentile": bands[0], "Median": bands[1], "95th Percentile": bands[2]},
+    index=pd.RangeIndex(1, years + 1, name="Years Ahead"),
+)
+st.line_chart(fan_df, height=360, x_label="Years Ahead", y_label="Projected Annual Income (AED)")
+st.caption("500 simulated careers with the Balanced Path settings; 90% of them end between the outer lines.")
 
 # --------------------------------------------
 # SUMMARY STATS
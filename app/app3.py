@@ -1,7 +1,6 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 
 st.set_page_config(page_title="TimeShiftAI", layout="wide")
 
@@ -27,8 +26,9 @@ growth = {
     "Go Freelance": 0.12
 }[scenario]
 
-future_income = [salary * ((1 + growth) ** i) for i in range(years + 1)]
-net_savings = [savings + (income - family_expense*12 - emi*12) for income in future_income]
+yearly_expense = (family_expense + emi) * 12
+future_income = salary * (1 + growth) ** np.arange(years + 1)
+net_savings = savings + future_income - yearly_expense
 
 st.subheader(f"📊 Projected Wealth for '{scenario}' ({currency})")
 st.line_chart(pd.DataFrame(net_savings, columns=["Predicted Wealth"]))
@@ -1,32 +1,27 @@
 # app/app.py
-import requests
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
 import streamlit as st
 import pandas as pd
 import numpy as np
+from typing import Optional
+from utils.simulation_core import BASE_GROWTH, SCENARIO_NAMES, VOLATILITY, simulate_scenarios
 
+RNG = np.random.default_rng()
 
-# ✅ Must come before any Streamlit UI commands
-st.set_page_config(
-    page_title="TimeShiftAI — Future Decision Lab",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# ---------------- HAPPINESS MOCK ----------------
+_HAPPINESS_NAMES = ("Stay in Job", "Go Freelance", "Join Startup")
+_HAPPINESS_LOW = np.array([6, 7, 4])
+_HAPPINESS_HIGH = np.array([8, 9, 7])
 
-# Hide the sidebar toggle (keyboard_double_arrow_right)
-st.markdown("""
+_PAGE_CSS = """
     <style>
+        /* Hide the sidebar toggle (keyboard_double_arrow_right) */
         [data-testid="collapsedControl"] {
             display: none;
         }
-    </style>
-""", unsafe_allow_html=True)
-
-# ---------------- PAGE CONFIG ----------------
-st.set_page_config(page_title="TimeShiftAI — Future Decision Lab", layout="wide", page_icon="🕰️")
-
-# ---------------- CUSTOM STYLE ----------------
-st.markdown("""
-    <style>
         * {
             font-family: 'Segoe UI', sans-serif !important;
         }
@@ -57,7 +52,19 @@ st.markdown("""
             padding-bottom: 1rem;
         }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+# ---------------- PAGE CONFIG ----------------
+# ✅ Must come before any Streamlit UI commands
+st.set_page_config(
+    page_title="TimeShiftAI — Future Decision Lab",
+    page_icon="🕰️",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# ---------------- CUSTOM STYLE ----------------
+st.markdown(_PAGE_CSS, unsafe_allow_html=True)
 
 # ---------------- HEADER ----------------
 st.title("🕰️ TimeShiftAI — The Future Decision Lab")
@@ -72,19 +79,40 @@ st.sidebar.header("🎯 Your Current Profile")
 currency = st.sidebar.selectbox("Preferred Currency 💱", ["AED", "USD", "INR", "EUR", "GBP"])
 
 # --- Currency Conversion ---
-base_currency = "AED"
-conversion_rate = 1.0
-
-if currency != base_currency:
+@st.cache_resource
+def _http_session():
+    """Pooled HTTP session for the currency API (kept alive across reruns)."""
+    # lazy import: only non-AED currencies ever reach the network
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry
+
+    session = requests.Session()
+    retry = Retry(total=2, read=0, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    session.mount("https://", HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=10))
+    return session
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_fx_rate(base: str, target: str) -> float:
+    """Exchange rate lookup, cached for an hour so reruns skip the network."""
+    r = _http_session().get(f"https://api.exchangerate.host/latest?base={base}&symbols={target}", timeout=(3, 5))
+    r.raise_for_status()
+    return float(r.json()["rates"][target])
+
+# Short negative cache: a broken API costs at most one round-trip per minute
+@st.cache_data(ttl=60, show_spinner=False)
+def fx_rate_or_none(base: str, target: str) -> Optional[float]:
+    """Like get_fx_rate, but a failed lookup returns None and is cached briefly."""
     try:
-        response = requests.get(f"https://api.exchangerate.host/latest?base={base_currency}&symbols={currency}")
-        if response.status_code == 200:
-            data = response.json()
-            conversion_rate = data["rates"][currency]
-        else:
-            st.warning("⚠️ Currency conversion API unavailable, showing values in AED.")
+        return get_fx_rate(base, target)
     except Exception:
-        st.warning("⚠️ Could not fetch currency rates. Using AED values.")
+        return None
+
+base_currency = "AED"
+conversion_rate = 1.0 if currency == base_currency else fx_rate_or_none(base_currency, currency)
+if conversion_rate is None:
+    st.warning("⚠️ Could not fetch currency rates. Using AED values.")
+    conversion_rate = 1.0
 
 # --- Financial Inputs ---
 salary = st.sidebar.number_input(f"Current Monthly Salary ({currency})", value=15000)
@@ -95,72 +123,50 @@ risk_tolerance = st.sidebar.slider("Risk Appetite (0 = Low, 10 = High)", 0, 10,
 years = st.sidebar.slider("Years to Simulate", 1, 20, 10)
 growth_bias = st.sidebar.slider("Market Growth Bias (%)", 0, 15, 5)
 
-# ---------------- SCENARIO DEFINITIONS ----------------
-scenarios = {
-    "Stay in Job": {"growth": 0.05 + growth_bias / 100, "volatility": 0.02},
-    "Join Startup": {"growth": 0.12 + growth_bias / 100, "volatility": 0.08},
-    "Go Freelance": {"growth": 0.08 + growth_bias / 100, "volatility": 0.05},
-}
-
 # ---------------- SIMULATION LOGIC ----------------
-data = []
-for scenario, vals in scenarios.items():
-    incomes = [salary * 12]
-    wealth = [savings]
-    for year in range(1, years + 1):
-        income = incomes[-1] * (1 + np.random.normal(vals["growth"], vals["volatility"]))
-        yearly_expense = (family_expense + emi) * 12
-        net = wealth[-1] + income - yearly_expense
-        incomes.append(income)
-        wealth.append(net)
-    df = pd.DataFrame({"Year": range(0, years + 1), "Wealth": wealth})
-    df["Scenario"] = scenario
-    data.append(df)
-
-df_all = pd.concat(data)
+@st.cache_data(show_spinner=False)
+def run_simulation(salary, savings, family_expense, emi, years, growth_bias, seed):
+    """Simulated wealth matrix (one row per scenario, one column per year), cached on the inputs."""
+    growth = BASE_GROWTH + growth_bias / 100
+    yearly_expense = (family_expense + emi) * 12
+    return simulate_scenarios(salary, savings, yearly_expense, years, growth, VOLATILITY, seed)
+
+# fixed per session so reruns with unchanged inputs hit the cache
+seed = st.session_state.setdefault("seed", 42)
+wealth_mat = run_simulation(salary, savings, family_expense, emi, years, growth_bias, seed)
 
 # ---------------- MAIN LAYOUT ----------------
 col1, col2 = st.columns([1.7, 1])
 
 with col1:
     st.subheader(f"💰 Projected Wealth Over {years} Years ({currency})")
-    converted_df = df_all.copy()
-    converted_df["Wealth"] = converted_df["Wealth"] * conversion_rate
-    st.line_chart(
-        converted_df.pivot(index="Year", columns="Scenario", values="Wealth"),
-        height=420
+    pivot = pd.DataFrame(
+        wealth_mat.T * conversion_rate,
+        index=pd.RangeIndex(years + 1, name="Year"),
+        columns=list(SCENARIO_NAMES),
     )
+    st.line_chart(pivot, height=420)
 
 # --- INSIGHT SNAPSHOT ---
 with col2:
     st.subheader("📊 Snapshot Insights")
 
-    last_values = df_all[df_all["Year"] == years][["Scenario", "Wealth"]].reset_index(drop=True)
+    # Final-year wealth per scenario; pick the best and worst rows by position
+    final = wealth_mat[:, -1]
+    best_i, worst_i = int(np.argmax(final)), int(np.argmin(final))
 
-    # Extract the single best and worst rows correctly
-    best_row = last_values.loc[last_values["Wealth"].idxmax()]
-    worst_row = last_values.loc[last_values["Wealth"].idxmin()]
+    best_wealth = final[best_i] * conversion_rate
+    worst_wealth = final[worst_i] * conversion_rate
 
-    # Safely convert values
-    best_wealth = float(best_row["Wealth"]) * conversion_rate
-    worst_wealth = float(worst_row["Wealth"]) * conversion_rate
-
-    st.metric("💹 Best Financial Path", best_row["Scenario"], f"{best_wealth:,.0f} {currency}")
-    st.metric("⚠️ Lowest Return Path", worst_row["Scenario"], f"{worst_wealth:,.0f} {currency}")
+    st.metric("💹 Best Financial Path", SCENARIO_NAMES[best_i], f"{best_wealth:,.0f} {currency}")
+    st.metric("⚠️ Lowest Return Path", SCENARIO_NAMES[worst_i], f"{worst_wealth:,.0f} {currency}")
 
     # --- OPTIONAL: Simulated Happiness Metrics ---
-    job_satisfaction = np.random.uniform(6, 8)  # mock for demo
-    freelance_freedom = np.random.uniform(7, 9)
-    startup_pressure = np.random.uniform(4, 7)
-
-    happiness = {
-        "Stay in Job": job_satisfaction,
-        "Go Freelance": freelance_freedom,
-        "Join Startup": startup_pressure
-    }
-
-    h_df = pd.DataFrame.from_dict(happiness, orient='index', columns=['Happiness Score'])
-    st.bar_chart(h_df)
+    # job satisfaction, freelance freedom, startup pressure (mock for demo)
+    scores = RNG.uniform(_HAPPINESS_LOW, _HAPPINESS_HIGH)
+    happiness = dict(zip(_HAPPINESS_NAMES, scores))
+
+    st.bar_chart(pd.Series(happiness, name="Happiness Score"))
 
 # --- FINAL INSIGHT ---
 st.markdown("---")
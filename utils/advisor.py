@@ -0,0 +1,94 @@
+import re
+from functools import lru_cache
+
+# Keyword -> intent table; one regex pass finds every keyword in the question.
+_CLASSIFIER = re.compile(r"startup|freelancing|freelance|savings|save|compare|job")
+_KEYWORD_INTENT = {
+    "startup": "startup",
+    "freelance": "freelance",
+    "freelancing": "freelance",
+    "save": "save",
+    "savings": "save",
+    "compare": "compare",
+    "job": "job",
+}
+
+LOW_RISK, MEDIUM_RISK, HIGH_RISK = 0, 1, 2
+
+def risk_bucket(risk_tol):
+    # 0-3 low, 4-7 medium, 8-10 high
+    if risk_tol <= 3:
+        return LOW_RISK
+    if risk_tol <= 7:
+        return MEDIUM_RISK
+    return HIGH_RISK
+
+def classify(question):
+    found = {_KEYWORD_INTENT[kw] for kw in _CLASSIFIER.findall(question.lower())}
+    for intent in ("startup", "freelance", "save"):
+        if intent in found:
+            return intent
+    if {"compare", "job", "startup"} <= found:
+        return "compare"
+    return None
+
+def _startup_advice(savings, emi, family_expense, bucket, job_growth, startup_growth):
+    # give data-aware guidance
+    est_runway = savings / ((family_expense + emi) if (family_expense + emi) > 0 else 1)
+    advice = (
+        f"Joining a startup typically increases income volatility. With current savings of {savings:,.0f} "
+        f"and monthly outflows {(family_expense + emi):,.0f}, your runway is ~{est_runway:.1f} months. "
+        "If runway < 6 months, secure additional buffer or phased transition. "
+    )
+    if bucket == LOW_RISK:
+        advice += "Your low risk tolerance suggests avoiding full-time startup exposure."
+    elif bucket == MEDIUM_RISK:
+        advice += "Consider a part-time pilot or equity-for-lower-pay arrangement initially."
+    else:
+        advice += "Your profile supports higher risk; ensure legal/financial protections and plan exits."
+    return advice
+
+def _freelance_advice(savings, emi, family_expense, bucket, job_growth, startup_growth):
+    avg_monthly_need = (family_expense + emi)
+    advice = (
+        f"Freelancing gives flexibility but variable revenue. Target building a 3–6 month revenue pipeline before leaving a steady job. "
+        f"With monthly obligations of {avg_monthly_need:,.0f}, ensure contracts or retained clients cover core expenses."
+    )
+    if bucket == LOW_RISK:
+        advice += " Given low risk tolerance, keep freelancing as a secondary income initially."
+    else:
+        advice += " Consider a 3–6 month trial period and track client churn metrics."
+    return advice
+
+def _savings_advice(savings, emi, family_expense, bucket, job_growth, startup_growth):
+    recommended_pct = 0.2 if bucket == LOW_RISK else 0.25
+    return (
+        f"Analytical recommendation: target saving {int(recommended_pct*100)}% of monthly income. "
+        f"Automate transfers to a liquid emergency fund first, then systematic investments (monthly)."
+    )
+
+def _compare_advice(savings, emi, family_expense, bucket, job_growth, startup_growth):
+    # quick quantitative comparison using first-year expectation
+    return (
+        f"Model comparison (first-order): expected growth rate job={job_growth:.2%}, startup={startup_growth:.2%}. "
+        "Startups show higher mean growth but higher volatility; quantify required emergency buffer and expected income variance."
+    )
+
+def _fallback_advice(savings, emi, family_expense, bucket, job_growth, startup_growth):
+    # fallback professional answer referencing memory and inputs
+    return (
+        "I recommend running 'what-if' experiments in the simulator for scenarios you care about (e.g., +20% salary, +30% family expenses). "
+        "If you provide a specific hypothesis (e.g., 'What if my salary increases by 20% in 2 years?') I will produce a focused analytical recommendation."
+    )
+
+_HANDLERS = {
+    "startup": _startup_advice,
+    "freelance": _freelance_advice,
+    "save": _savings_advice,
+    "compare": _compare_advice,
+}
+
+@lru_cache(maxsize=256)
+def render_advice(intent, bucket, savings, emi, family_expense, job_growth, startup_growth):
+    handler = _HANDLERS.get(intent, _fallback_advice)
+    return handler(savings, emi, family_expense, bucket, job_growth, startup_growth)
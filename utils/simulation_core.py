@@ -1,9 +1,34 @@
 import numpy as np
 
+# Career scenarios shared by the multi-scenario apps; growth gets the market bias added on top
+SCENARIO_NAMES = ("Stay in Job", "Join Startup", "Go Freelance")
+BASE_GROWTH = np.array([0.05, 0.12, 0.08])
+VOLATILITY = np.array([0.02, 0.08, 0.05])
+
 def simulate_path(base_salary, growth_rate, volatility, risk_tolerance, years=10, seed=42):
+    # single-path ensemble; same seed gives the same draws as the old loop
+    return simulate_ensemble(1, base_salary, growth_rate, volatility, risk_tolerance, years, seed)[0]
+
+def simulate_ensemble(n_paths, base_salary, growth_rate, volatility, risk_tolerance, years=10, seed=42):
+    # years <= 1 still yields [base_salary] per path, like the original loop
+    steps = max(years - 1, 0)
     rng = np.random.default_rng(seed)
-    salary = [base_salary]
-    for _ in range(years - 1):
-        change = growth_rate + rng.normal(0, volatility)
-        salary.append(salary[-1] * (1 + change * risk_tolerance))
+    change = growth_rate + rng.normal(0, volatility, size=(n_paths, steps))
+    salary = np.empty((n_paths, steps + 1))
+    salary[:, 0] = base_salary
+    salary[:, 1:] = base_salary * np.cumprod(1 + change * risk_tolerance, axis=1)
     return salary
+
+def ensemble_bands(paths, percentiles=(5, 50, 95)):
+    return np.percentile(paths, percentiles, axis=0)
+
+def simulate_scenarios(salary, savings, yearly_expense, years, growth, volatility, seed=42):
+    # one row of yearly wealth per scenario, column 0 is today's savings
+    rng = np.random.default_rng(seed)
+    n = growth.shape[0]
+    z = rng.standard_normal((n, years))
+    factors = 1.0 + growth[:, None] + volatility[:, None] * z
+    income = (salary * 12) * np.cumprod(factors, axis=1)
+    # closed form of wealth[t] = wealth[t-1] + income[t] - expense
+    wealth = savings + np.cumsum(income, axis=1) - yearly_expense * np.arange(1, years + 1)
+    return np.hstack([np.full((n, 1), savings), wealth])